@@ -2,7 +2,7 @@ import streamlit as st
 import pandas as pd
 from datetime import datetime, timedelta
 from schedule_scrape import get_nfl_schedule
-from prediction_input import load_model, get_team_stats, prepare_input_data
+from prediction_input import load_model, get_team_stats, get_model_hash, predict_slate, get_top_contributions
 from sklearn.preprocessing import StandardScaler
 import joblib
 from injury_report import display_injury_report, get_injury_counts
@@ -23,11 +23,8 @@ def get_upcoming_games(schedule, start_date, end_date):
     end_datetime = pd.to_datetime(end_date)
     return schedule[(schedule['gameday'] >= start_datetime) & (schedule['gameday'] <= end_datetime)]
 
-def make_prediction(model, scaler, team_stats, home_team, away_team):
-    input_data = prepare_input_data(home_team, away_team, team_stats)
-    input_data_scaled = scaler.transform(input_data)
-    prediction = model.predict(input_data_scaled)[0]
-    return prediction
+def format_contributions(side_contributions):
+    return ", ".join(f"{stat.split('_', 1)[1]} ({value:+.2f})" for stat, value in side_contributions.items())
 
 def main():
     st.sidebar.title("Navigation")
@@ -44,6 +41,7 @@ def display_predictions():
     # Load the model
     print("Loading model...")
     model = load_model('nfl_xgboost_model.json')
+    model_hash = get_model_hash('nfl_xgboost_model.json')
 
     # Load the scaler
     print("Loading scaler...")
@@ -87,6 +85,10 @@ def display_predictions():
         # Create a list to store prediction results
         prediction_results = []
         
+        # Predict and explain the whole slate in one batch
+        games = [(game['home_team'], game['away_team']) for _, game in upcoming_games.iterrows()]
+        slate_predictions = predict_slate(model, scaler, team_stats, games, model_hash)
+        
         for _, game in upcoming_games.iterrows():
             home_team = game['home_team']
             away_team = game['away_team']
@@ -106,8 +108,9 @@ def display_predictions():
             st.markdown(f"### <span style='color:{away_color}'>{away_team}</span> ({away_injuries} injuries) @ <span style='color:{home_color}'>{home_team}</span> ({home_injuries} injuries) - {game_date}", unsafe_allow_html=True)
             st.write(odds_info)
             
-            try:
-                prediction = make_prediction(model, scaler, team_stats, home_team, away_team)
+            if (home_team, away_team) in slate_predictions:
+                game_prediction = slate_predictions[(home_team, away_team)]
+                prediction = game_prediction['prediction']
                 if prediction > 0:
                     winner = home_team
                     loser = away_team
@@ -119,6 +122,14 @@ def display_predictions():
                 
                 st.write(f"Prediction: {winner} will defeat {loser} by {point_difference:.2f} points.")
                 
+                # Show the stats driving the predicted margin
+                top_stats = get_top_contributions(game_prediction['contributions'])
+                with st.expander("Why this prediction?"):
+                    st.write(f"Baseline home margin: {game_prediction['bias']:+.2f}")
+                    st.write(f"{home_team} stats: {format_contributions(top_stats['home'])}")
+                    st.write(f"{away_team} stats: {format_contributions(top_stats['away'])}")
+                    st.caption("Values are points added to the home margin.")
+                
                 # Add prediction result to the list
                 prediction_results.append({
                     'Date': game_date,
@@ -133,7 +144,7 @@ def display_predictions():
                     'Away Team Line': away_line,
                     'Away Team Odds': away_odds
                 })
-            except KeyError:
+            else:
                 st.write("Unable to make prediction due to missing team data.")
         
         # Create a download button for CSV
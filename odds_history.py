@@ -0,0 +1,252 @@
+import csv
+import hashlib
+import os
+import time
+from datetime import datetime
+import requests
+import pandas as pd
+from odds_table import url, parse_odds_table
+
+# Compact time-series file of line movements
+history_file = 'nfl_odds_history.csv'
+
+# Each record is one changed cell. 'dt' is seconds since the previous record
+# (the first record holds the absolute epoch), so unchanged cells cost nothing.
+# A 'Removed' record marks a team dropping off the board once its game is over
+history_fields = ['dt', 'number', 'team', 'book', 'field', 'value']
+
+# Function to rebuild the latest value of every cell by streaming the history file
+def load_latest_state(path=history_file):
+    state = {}
+    last_time = 0
+    if not os.path.exists(path):
+        return state, last_time
+    with open(path, newline='') as f:
+        for record in csv.DictReader(f):
+            last_time += int(record['dt'])
+            if record['field'] == 'Removed':
+                remove_game(state, record['number'], record['team'])
+            else:
+                state[(record['number'], record['team'], record['book'], record['field'])] = record['value']
+    return state, last_time
+
+# Function to drop every cell of a team's game from the latest state
+def remove_game(state, number, team):
+    for key in [key for key in state if key[:2] == (number, team)]:
+        del state[key]
+
+# The odds page lists each team once per market, in this order
+markets = ['Spread', 'Total', 'Moneyline']
+
+# Function to flatten an odds DataFrame into {(number, team, book, field): value}
+def snapshot_cells(df):
+    cells = {}
+    market_index = df.groupby(['Number', 'Team']).cumcount()
+    for index, (_, row) in zip(market_index, df.iterrows()):
+        market = markets[index] if index < len(markets) else f"Market {index + 1}"
+        for column in df.columns[2:]:
+            book, field = column.rsplit(' ', 1)
+            cells[(row['Number'], row['Team'], book, f"{market} {field}")] = row[column]
+    return cells
+
+# Number of parsed polls a team must be missing before its game counts as finished
+removal_polls = 3
+
+# Function to append only the cells that changed since the last snapshot
+def append_changes(cells, state, last_time, poll_time, missing_polls=None, path=history_file):
+    changes = [(key, value) for key, value in cells.items() if state.get(key) != value]
+
+    # Teams missing for several polls in a row have finished their game.
+    # A single missed poll is usually a partial page, not a finished game
+    if missing_polls is None:
+        missing_polls = {}
+    current_games = {key[:2] for key in cells}
+    for game in current_games:
+        missing_polls.pop(game, None)
+    removed_games = []
+    for game in sorted({key[:2] for key in state} - current_games):
+        missing_polls[game] = missing_polls.get(game, 0) + 1
+        if missing_polls[game] >= removal_polls:
+            removed_games.append(game)
+            del missing_polls[game]
+    changes += [((number, team, '', 'Removed'), '') for number, team in removed_games]
+    if not changes:
+        return last_time
+
+    write_header = not os.path.exists(path)
+    with open(path, 'a', newline='') as f:
+        writer = csv.writer(f)
+        if write_header:
+            writer.writerow(history_fields)
+        for key, value in changes:
+            writer.writerow([poll_time - last_time, *key, value])
+            last_time = poll_time
+            if key[3] == 'Removed':
+                remove_game(state, key[0], key[1])
+            else:
+                state[key] = value
+
+    print(f"Recorded {len(changes)} changed cells at {datetime.fromtimestamp(poll_time).isoformat()}")
+    return last_time
+
+# Function to poll the odds page and record line movement
+def poll_odds(interval=300, polls=None, timeout=30, path=history_file):
+    state, last_time = load_latest_state(path)
+    missing_polls = {}
+    session = requests.Session()
+    conditional_headers = {}
+    last_digest = None
+    count = 0
+
+    while polls is None or count < polls:
+        try:
+            response = session.get(url, headers=conditional_headers, timeout=timeout)
+            poll_time = int(time.time())
+
+            # Skip parsing when the server says nothing changed
+            if response.status_code == 304:
+                print("Odds page not modified, skipping")
+            elif response.status_code != 200:
+                print(f"Odds page returned status {response.status_code}, skipping")
+            else:
+                conditional_headers = {}
+                if response.headers.get('ETag'):
+                    conditional_headers['If-None-Match'] = response.headers['ETag']
+                if response.headers.get('Last-Modified'):
+                    conditional_headers['If-Modified-Since'] = response.headers['Last-Modified']
+
+                # Fall back to a content hash when the server ignores conditional requests
+                digest = hashlib.sha1(response.content).hexdigest()
+                if digest == last_digest:
+                    print("Odds page unchanged, skipping")
+                else:
+                    df = parse_odds_table(response.content)
+                    if df.empty:
+                        # Don't mark every game as removed because of a blank table
+                        print("Odds table is empty, skipping")
+                    else:
+                        last_time = append_changes(snapshot_cells(df), state, last_time, poll_time, missing_polls, path)
+                        last_digest = digest
+        except requests.RequestException as e:
+            print(f"Failed to fetch odds: {e}")
+        except (IndexError, ValueError) as e:
+            # Page layout changed or came back partial
+            print(f"Failed to parse odds: {e}")
+        except OSError as e:
+            print(f"Failed to write odds history: {e}")
+
+        count += 1
+        if polls is None or count < polls:
+            time.sleep(interval)
+
+# Function to stream history records with absolute timestamps
+def iter_history(path=history_file):
+    if not os.path.exists(path):
+        return
+    current_time = 0
+    with open(path, newline='') as f:
+        for record in csv.DictReader(f):
+            current_time += int(record['dt'])
+            record['time'] = current_time
+            yield record
+
+# Function to get the (number, team) pairs of a game, by team or rotation number
+def get_game_keys(team_name=None, number=None, path=history_file):
+    if number is not None:
+        number = int(number)
+        # Away team has the odd rotation number, home team the next even one
+        away_number = number if number % 2 else number - 1
+        return {str(away_number), str(away_number + 1)}, None
+
+    # Find the team's most recent game and the opponent listed alongside it
+    team_on_number = {}
+    game_number = None
+    opponent = None
+    for record in iter_history(path):
+        team_on_number[record['number']] = record['team']
+        if record['team'] == team_name:
+            game_number = int(record['number'])
+            partner = str(game_number + 1 if game_number % 2 else game_number - 1)
+            opponent = team_on_number.get(partner)
+        elif game_number is not None and record['number'] == partner and team_on_number.get(str(game_number)) == team_name:
+            opponent = record['team']
+    if game_number is None:
+        return set(), None
+    game_keys = {(str(game_number), team_name)}
+    if opponent is not None:
+        game_keys.add((partner, opponent))
+    return {key[0] for key in game_keys}, game_keys
+
+# Function to get the line and price history for a game, by team or rotation number
+def get_line_history(team_name=None, number=None, book=None, path=history_file):
+    numbers, game_keys = get_game_keys(team_name, number, path)
+    history = []
+    team_on_number = {}
+    for record in iter_history(path):
+        if record['number'] not in numbers or record['field'] == 'Removed':
+            continue
+        if game_keys is not None and (record['number'], record['team']) not in game_keys:
+            continue
+        if team_on_number.get(record['number'], record['team']) != record['team']:
+            # A rotation number reused by another team starts a new game
+            history = [row for row in history if row['Number'] != record['number']]
+        team_on_number[record['number']] = record['team']
+        if book is None or record['book'] == book:
+            history.append({
+                'Time': datetime.fromtimestamp(record['time']),
+                'Number': record['number'],
+                'Team': record['team'],
+                'Book': record['book'],
+                'Field': record['field'],
+                'Value': record['value']
+            })
+    return pd.DataFrame(history, columns=['Time', 'Number', 'Team', 'Book', 'Field', 'Value'])
+
+# Function to find the teams whose spreads moved the most across the current slate
+def get_biggest_movers(top_n=10, book=None, path=history_file):
+    first_lines = {}
+    last_lines = {}
+    for record in iter_history(path):
+        if record['field'] == 'Removed':
+            # Finished games are not part of the current slate
+            for key in [key for key in first_lines if key[:2] == (record['number'], record['team'])]:
+                del first_lines[key]
+                del last_lines[key]
+            continue
+        if record['field'] != 'Spread Line' or (book is None and record['book'] in ('Time', 'Open')):
+            continue
+        if book is not None and record['book'] != book:
+            continue
+        try:
+            line = float(record['value'])
+        except ValueError:
+            continue  # Skip 'N/A' and empty lines
+        key = (record['number'], record['team'], record['book'])
+        first_lines.setdefault(key, line)
+        last_lines[key] = line
+
+    movers = []
+    for (number, team, line_book), first_line in first_lines.items():
+        movement = last_lines[(number, team, line_book)] - first_line
+        if movement:
+            movers.append({
+                'Number': number,
+                'Team': team,
+                'Book': line_book,
+                'First Line': first_line,
+                'Current Line': last_lines[(number, team, line_book)],
+                'Movement': movement
+            })
+
+    movers_df = pd.DataFrame(movers, columns=['Number', 'Team', 'Book', 'First Line', 'Current Line', 'Movement'])
+    if movers_df.empty:
+        return movers_df
+
+    # Keep the largest move per team across sportsbooks
+    movers_df = movers_df.reindex(movers_df['Movement'].abs().sort_values(ascending=False).index)
+    movers_df = movers_df.drop_duplicates(subset=['Number', 'Team'], keep='first')
+    return movers_df.head(top_n).reset_index(drop=True)
+
+if __name__ == "__main__":
+    # Poll every 5 minutes until interrupted
+    poll_odds(interval=300)
@@ -5,6 +5,11 @@ from sklearn.preprocessing import StandardScaler
 from friendly_scrape import scrape_url_with_timestamp, urls
 from orchestration import standardize_team_names
 import joblib  # Add this import
+import hashlib
+from xgboost import DMatrix
+
+# Cache of per-game contributions keyed by (model hash, stats snapshot)
+contribution_cache = {}
 
 def load_model(model_path):
     model = XGBRegressor()
@@ -36,6 +41,64 @@ def prepare_input_data(home_team, away_team, team_stats):
     input_data = pd.concat([home_stats, away_stats])
     return input_data.to_frame().T
 
+# Function to hash the model file so cached contributions follow model updates
+def get_model_hash(model_path):
+    with open(model_path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+# Function to fingerprint the team stats used for a slate
+def get_stats_snapshot(team_stats):
+    return hashlib.sha1(pd.util.hash_pandas_object(team_stats).values.tobytes()).hexdigest()
+
+# Function to predict a whole slate and compute per-game feature contributions in one batch
+def predict_slate(model, scaler, team_stats, games, model_hash):
+    cache_key = (model_hash, get_stats_snapshot(team_stats))
+    if cache_key not in contribution_cache:
+        # Model or stats changed, so older contributions are stale
+        contribution_cache.clear()
+    cached = contribution_cache.setdefault(cache_key, {})
+
+    # Only build inputs for games not already cached
+    missing_games = []
+    input_frames = []
+    for home_team, away_team in games:
+        if (home_team, away_team) in cached:
+            continue
+        try:
+            input_frames.append(prepare_input_data(home_team, away_team, team_stats))
+            missing_games.append((home_team, away_team))
+        except KeyError:
+            print(f"Missing team data for {away_team} @ {home_team}")
+
+    if input_frames:
+        input_data = pd.concat(input_frames, ignore_index=True)
+        feature_names = list(input_data.columns)
+
+        # Use the same scaled matrix for predictions and contributions
+        input_data_scaled = scaler.transform(input_data)
+        predictions = model.predict(input_data_scaled)
+        contributions = model.get_booster().predict(DMatrix(input_data_scaled), pred_contribs=True)
+
+        for i, game in enumerate(missing_games):
+            # Last column is the bias term
+            game_contributions = pd.Series(contributions[i, :-1], index=feature_names)
+            cached[game] = {
+                'prediction': float(predictions[i]),
+                'bias': float(contributions[i, -1]),
+                'contributions': game_contributions
+            }
+
+    return {game: cached[game] for game in games if game in cached}
+
+# Function to get the home and away stats pushing the margin the most
+def get_top_contributions(contributions, top_n=3):
+    top_stats = {}
+    for side in ['home', 'away']:
+        side_contributions = contributions[contributions.index.str.startswith(f'{side}_')]
+        order = side_contributions.abs().sort_values(ascending=False).index[:top_n]
+        top_stats[side] = side_contributions[order]
+    return top_stats
+
 def main():
     # Load the model
     model = load_model('nfl_xgboost_model.json')